@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Compiled kernels for the 6x6 member matrices of a grid member.
+
+Each kernel writes into a caller-supplied `(6,6)` buffer so that nothing is
+allocated inside the kernel. When `numba` is installed the kernels are compiled
+to machine code on first use, and the compiled code is cached on disk;
+otherwise they run as plain Python on the same buffers.
+"""
+
+import functools
+
+
+def _jit(func):
+    """
+    Compiles `func` with `numba` on its first call, if installed, so that
+    importing ospgrid does not load `numba`.
+    """
+    compiled = None
+
+    @functools.wraps(func)
+    def wrapper(*args):
+        nonlocal compiled
+        if compiled is None:
+            try:
+                from numba import njit
+
+                compiled = njit(cache=True, fastmath=True)(func)
+            except ImportError:  # pragma: no cover
+                compiled = func
+        return compiled(*args)
+
+    return wrapper
+
+
+@_jit
+def local_k(EI, GJ, L, out):
+    """
+    Writes the member stiffness matrix in local coordinates into `out`, with
+    nodal DOFs in the order DZ, RX, RY.
+    """
+    k11 = 12.0 * EI / L**3
+    k13 = 6.0 * EI / L**2
+    k22 = GJ / L
+    k33 = 4.0 * EI / L
+    k36 = 2.0 * EI / L
+
+    out[:, :] = 0.0
+    out[0, 0] = out[3, 3] = k11
+    out[0, 3] = out[3, 0] = -k11
+    out[0, 2] = out[2, 0] = out[0, 5] = out[5, 0] = k13
+    out[2, 3] = out[3, 2] = out[3, 5] = out[5, 3] = -k13
+    out[1, 1] = out[4, 4] = k22
+    out[1, 4] = out[4, 1] = -k22
+    out[2, 2] = out[5, 5] = k33
+    out[2, 5] = out[5, 2] = k36
+
+
+@_jit
+def transform(c, s, out):
+    """
+    Writes the member transformation matrix for direction cosine `c` and sine
+    `s` into `out`.
+    """
+    out[:, :] = 0.0
+    out[0, 0] = out[3, 3] = 1.0
+    out[1, 1] = out[4, 4] = c
+    out[1, 2] = out[4, 5] = s
+    out[2, 1] = out[5, 4] = -s
+    out[2, 2] = out[5, 5] = c
+
+
+@_jit
+def global_k_closed(EI, GJ, L, c, s, out):
+    """
+    Writes the member stiffness matrix in global coordinates, `T.T @ K @ T`,
+    into `out`, using its closed form in terms of the member properties and the
+    direction cosine `c` and sine `s`.
+    """
+    k11 = 12.0 * EI / L**3
+    k13 = 6.0 * EI / L**2
+    k22 = GJ / L
+    k33 = 4.0 * EI / L
+    k36 = 2.0 * EI / L
+
+    cc = c * c
+    ss = s * s
+    cs = c * s
+    ck13 = c * k13
+    sk13 = s * k13
+    kxx = cc * k22 + ss * k33  # rotation about x, own node
+    kyy = cc * k33 + ss * k22  # rotation about y, own node
+    kxy = cs * (k22 - k33)
+    kxx_ij = ss * k36 - cc * k22
+    kyy_ij = cc * k36 - ss * k22
+    kxy_ij = -cs * (k22 + k36)
+
+    # Upper triangle, row by row
+    out[0, 0] = k11
+    out[0, 1] = -sk13
+    out[0, 2] = ck13
+    out[0, 3] = -k11
+    out[0, 4] = -sk13
+    out[0, 5] = ck13
+
+    out[1, 1] = kxx
+    out[1, 2] = kxy
+    out[1, 3] = sk13
+    out[1, 4] = kxx_ij
+    out[1, 5] = kxy_ij
+
+    out[2, 2] = kyy
+    out[2, 3] = -ck13
+    out[2, 4] = kxy_ij
+    out[2, 5] = kyy_ij
+
+    out[3, 3] = k11
+    out[3, 4] = sk13
+    out[3, 5] = -ck13
+
+    out[4, 4] = kxx
+    out[4, 5] = kxy
+
+    out[5, 5] = kyy
+
+    # The lower triangle follows by symmetry
+    for i in range(1, 6):
+        for j in range(i):
+            out[i, j] = out[j, i]
+
@@ -7,14 +7,17 @@ Created on Mon Feb 21 20:25:38 2022
 """
 
 from enum import Enum
-import itertools
+from functools import cached_property
+import math
+import numbers
 from typing import Union, Tuple, List
+import weakref
 import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
 import opensees.openseespy as osp
 import opsvis as ospv
 import numpy as np
-from .utils import save_figs_to_file
+from .utils import save_fig_to_file
+from ._kernels import local_k, transform, global_k_closed
 
 
 class Support(Enum):
@@ -23,11 +26,42 @@ class Support(Enum):
     """
 
     # DX DY DZ RX RY RZ
-    PINNED_X = [1, 1, 1, 0, 1, 1]  # rotates about x axis
-    PINNED_Y = [1, 1, 1, 1, 0, 1]  # rotates about y axis
-    PROP = [1, 1, 1, 0, 0, 1]  # rotates about both
-    FIXED = [1, 1, 1, 1, 1, 1]  # fixed
-    FIXED_V_ROLLER = [1, 1, 0, 1, 1, 1]  # fixed but vertical roller
+    PINNED_X = (1, 1, 1, 0, 1, 1)  # rotates about x axis
+    PINNED_Y = (1, 1, 1, 1, 0, 1)  # rotates about y axis
+    PROP = (1, 1, 1, 0, 0, 1)  # rotates about both
+    FIXED = (1, 1, 1, 1, 1, 1)  # fixed
+    FIXED_V_ROLLER = (1, 1, 0, 1, 1, 1)  # fixed but vertical roller
+
+
+def _unpack_scale(
+    scale_factor: Union[float, List[float]],
+) -> Tuple[float, float, float, float]:
+    """
+    Unpacks the scale factors for :meth:`Grid.plot_results`.
+
+    Parameters
+    ----------
+    scale_factor : float, List[float]
+        A single number, the scale of the deformations, or a list of 4 scale
+        factors in the order deformations; bending; shear; torsion.
+
+    Raises
+    ------
+    ValueError
+        If a list of scale factors is not of length 4.
+
+    Returns
+    -------
+    Tuple[float, float, float, float]
+        The scale factors for the deformations, bending, shear, and torsion.
+
+    """
+    if isinstance(scale_factor, numbers.Real):
+        return float(scale_factor), 1.0, 1.0, 1.0
+
+    if len(scale_factor) != 4:
+        raise ValueError("The list of scale factors must have length 4.")
+    return tuple(float(sf) for sf in scale_factor)
 
 
 class Node:
@@ -35,6 +69,12 @@ class Node:
     Object representing a node of the grid
     """
 
+    # The grid's array view of its nodes depends on these attributes
+    _SOA_DEPENDS = ("idx", "x", "y")
+
+    # The grid's records of the loads and supports depend on these attributes
+    _LOAD_DEPENDS = ("Fz", "Mx", "My")
+
     def __init__(self, idx: int, label: str, x: float, y: float):
         """
         Initialize the node
@@ -63,6 +103,26 @@ class Node:
         self.Mx = 0
         self.My = 0
         self.support = None
+        self._grid = None
+
+    def __setattr__(self, name, value):
+        old_value = self.__dict__.get(name)
+        super().__setattr__(name, value)
+        grid = self.__dict__.get("_grid")
+        if grid is None:
+            return
+        if name == "label":
+            grid._relabel_node(self, old_value)
+        elif name in self._SOA_DEPENDS:
+            grid._invalidate_soa()
+            if name in ("x", "y"):
+                grid._update_geometry(self)
+            elif name == "idx":
+                grid._reindex_node(self)
+        elif name in self._LOAD_DEPENDS:
+            grid._record_load(self)
+        elif name == "support":
+            grid._record_support(self)
 
     def set_load(self, Fz: float = 0, Mx: float = 0, My: float = 0):
         """
@@ -108,6 +168,13 @@ class Member:
     Object encapsulating the proeprties for a grid member
     """
 
+    # The member matrices are cached, and depend on these attributes
+    _CACHED = ("K_local", "T", "K_global")
+    _CACHE_DEPENDS = ("EI", "GJ", "L", "delta_x", "delta_y", "node_i", "node_j")
+
+    # The grid's array view of its members depends on these attributes
+    _SOA_DEPENDS = ("idx", "EI", "GJ", "node_i", "node_j")
+
     def __init__(self, idx: int, node_i: Node, node_j: Node, EI: float, GJ: float):
         """
         Initialize the member object
@@ -135,9 +202,78 @@ class Member:
         self.node_j = node_j
         self.EI = EI
         self.GJ = GJ
+        self._set_geometry()
+        self._grid = None
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in ("node_i", "node_j") and "L" in self.__dict__:
+            # A new end node after initialization changes the member geometry
+            self._set_geometry()
+        if name in self._CACHE_DEPENDS:
+            # The cached matrices are stale once any of their inputs change
+            for key in self._CACHED:
+                self.__dict__.pop(key, None)
+        grid = self.__dict__.get("_grid")
+        if grid is not None and name in self._SOA_DEPENDS:
+            grid._invalidate_soa()
+            if name in ("node_i", "node_j"):
+                grid._member_by_endpoints = None
+
+    def _set_geometry(self):
+        """
+        Sets the member projections and length from the coordinates of its nodes.
+
+        Returns
+        -------
+        None.
+
+        """
         self.delta_x = self.node_j.x - self.node_i.x
         self.delta_y = self.node_j.y - self.node_i.y
-        self.L = np.sqrt(self.delta_x**2 + self.delta_y**2)
+        self.L = math.hypot(self.delta_x, self.delta_y)
+
+    @cached_property
+    def K_local(self) -> np.ndarray:
+        """
+        The member stiffness matrix in local coordinates with nodal DOFs
+        in the order DZ ('vertical' force), RX (torsion), RZ (bending moment).
+        It is computed once and cached as a read-only array.
+        """
+        K = np.empty((6, 6))
+        local_k(float(self.EI), float(self.GJ), self.L, K)
+        K.flags.writeable = False
+        return K
+
+    @cached_property
+    def T(self) -> np.ndarray:
+        """
+        The transformation matrix relating the member degrees of freedom from
+        local to global coordinate system. It is computed once and cached as a
+        read-only array.
+        """
+        c = self.delta_x / self.L
+        s = self.delta_y / self.L
+
+        T = np.empty((6, 6))
+        transform(c, s, T)
+        T.flags.writeable = False
+        return T
+
+    @cached_property
+    def K_global(self) -> np.ndarray:
+        """
+        The member stiffness matrix in global coordinates, per
+        :meth:`get_global_stiffness`. It is computed once and cached as a
+        read-only array.
+        """
+        c = self.delta_x / self.L
+        s = self.delta_y / self.L
+
+        Kg = np.empty((6, 6))
+        global_k_closed(float(self.EI), float(self.GJ), self.L, c, s, Kg)
+        Kg.flags.writeable = False
+        return Kg
 
     def get_local_stiffness(self) -> np.ndarray:
         """
@@ -150,25 +286,82 @@ class Member:
             Member stiffness matrix in local coordinates.
 
         """
+        return self.K_local.copy()
 
-        k11 = 12 * self.EI / self.L**3
-        k13 = 6 * self.EI / self.L**2
-        k22 = self.GJ / self.L
-        k33 = 4 * self.EI / self.L
-        k36 = 2 * self.EI / self.L
+    @classmethod
+    def batch_local_stiffness(
+        cls, EI: np.ndarray, GJ: np.ndarray, L: np.ndarray
+    ) -> np.ndarray:
+        """
+        Returns the local stiffness matrices of many members at once, with the
+        nodal DOFs ordered as per :meth:`get_local_stiffness`.
 
-        K = np.array(
-            [
-                [k11, 0, k13, -k11, 0, k13],
-                [0, k22, 0, 0, -k22, 0],
-                [k13, 0, k33, -k13, 0, k36],
-                [-k11, 0, -k13, k11, 0, -k13],
-                [0, -k22, 0, 0, k22, 0],
-                [k13, 0, k36, -k13, 0, k33],
-            ]
-        )
+        Parameters
+        ----------
+        EI : np.ndarray
+            The flexural rigidities of the members.
+        GJ : np.ndarray
+            The torsional rigidities of the members.
+        L : np.ndarray
+            The lengths of the members.
+
+        Returns
+        -------
+        K : np.ndarray
+            A `(N,6,6)` array of the member stiffness matrices in local coordinates.
+
+        """
+        EI = np.atleast_1d(np.asarray(EI, dtype=float))
+        GJ = np.atleast_1d(np.asarray(GJ, dtype=float))
+        L = np.atleast_1d(np.asarray(L, dtype=float))
+
+        k11 = 12 * EI / L**3
+        k13 = 6 * EI / L**2
+        k22 = GJ / L
+        k33 = 4 * EI / L
+        k36 = 2 * EI / L
+
+        K = np.zeros((len(L), 6, 6))
+        K[:, 0, 0] = K[:, 3, 3] = k11
+        K[:, 0, 3] = K[:, 3, 0] = -k11
+        K[:, 0, 2] = K[:, 2, 0] = K[:, 0, 5] = K[:, 5, 0] = k13
+        K[:, 2, 3] = K[:, 3, 2] = K[:, 3, 5] = K[:, 5, 3] = -k13
+        K[:, 1, 1] = K[:, 4, 4] = k22
+        K[:, 1, 4] = K[:, 4, 1] = -k22
+        K[:, 2, 2] = K[:, 5, 5] = k33
+        K[:, 2, 5] = K[:, 5, 2] = k36
         return K
 
+    @classmethod
+    def batch_transformation_matrix(cls, c: np.ndarray, s: np.ndarray) -> np.ndarray:
+        """
+        Returns the transformation matrices of many members at once, as per
+        :meth:`get_transformation_matrix`.
+
+        Parameters
+        ----------
+        c : np.ndarray
+            The direction cosines of the members with the x-axis.
+        s : np.ndarray
+            The direction sines of the members with the x-axis.
+
+        Returns
+        -------
+        T : np.ndarray
+            A `(N,6,6)` array of the member transformation matrices.
+
+        """
+        c = np.atleast_1d(np.asarray(c, dtype=float))
+        s = np.atleast_1d(np.asarray(s, dtype=float))
+
+        T = np.zeros((len(c), 6, 6))
+        T[:, 0, 0] = T[:, 3, 3] = 1.0
+        T[:, 1, 1] = T[:, 4, 4] = c
+        T[:, 1, 2] = T[:, 4, 5] = s
+        T[:, 2, 1] = T[:, 5, 4] = -s
+        T[:, 2, 2] = T[:, 5, 5] = c
+        return T
+
     def get_transformation_matrix(self) -> np.ndarray:
         """
         Gives the transformation matrix relating the member dgrees of freedom from
@@ -182,11 +375,7 @@ class Member:
             Tranformation matrix
 
         """
-        c = self.delta_x / self.L
-        s = self.delta_y / self.L
-
-        T = np.kron(np.eye(2, dtype=int), np.array([[1, 0, 0], [0, c, s], [0, -s, c]]))
-        return T
+        return self.T.copy()
 
     def get_global_stiffness(self) -> np.ndarray:
         """
@@ -201,10 +390,7 @@ class Member:
             Member stiffness matrix in global coordinates.
 
         """
-        K = self.get_local_stiffness()
-        T = self.get_transformation_matrix()
-        Kg = T.T @ K @ T
-        return Kg
+        return self.K_global.copy()
 
 
 class Grid:
@@ -215,6 +401,12 @@ class Grid:
 
     FIGSIZE = (6.0, 6.0)
 
+    # The OpenSees system of equations; a banded solver suits the RCM numbering
+    SOLVER = "BandGeneral"
+
+    # The grid and model key of the model currently held by OpenSeesPy
+    _active_analysis = None
+
     def __init__(self):
         """
         Initialize the grid
@@ -244,10 +436,20 @@ class Grid:
         None.
 
         """
+        # Detach the old nodes and members so later edits to them are ignored
+        for obj in getattr(self, "nodes", []) + getattr(self, "members", []):
+            obj._grid = None
+
         self.nodes = []
         self.members = []
         self.no_nodes = 0
         self.no_members = 0
+        self._node_by_label = {}
+        self._member_by_endpoints = {}
+        self._fix_args = {}
+        self._load_args = {}
+        self._system_stiffness = None
+        self._invalidate_soa()
 
     def add_node(self, label: str, x: float, y: float):
         """
@@ -270,9 +472,69 @@ class Grid:
         """
         self.no_nodes += 1
         node = Node(self.no_nodes, label, x, y)
+        node._grid = self
         self.nodes.append(node)
+        self._node_by_label.setdefault(label, []).append(node)
+        self._invalidate_soa()
         return node
 
+    def _record_support(self, node: Node):
+        """
+        Records the arguments for the support of a node to pass to OpenSeesPy.
+
+        Parameters
+        ----------
+        node : Node
+            The node whose support has been set.
+
+        Returns
+        -------
+        None.
+
+        """
+        if node.support is None:
+            self._fix_args.pop(node, None)
+        else:
+            self._fix_args[node] = (node.idx, *node.support.value)
+
+    def _reindex_node(self, node: Node):
+        """
+        Updates the support and load records of a node for its new index.
+
+        Parameters
+        ----------
+        node : Node
+            The node whose index has changed.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._record_support(node)
+        self._record_load(node)
+
+    def _record_load(self, node: Node):
+        """
+        Records the arguments for the load on a node to pass to OpenSeesPy. Nodes
+        without load are not recorded.
+
+        Parameters
+        ----------
+        node : Node
+            The node whose load has been set.
+
+        Returns
+        -------
+        None.
+
+        """
+        if node.Fz != 0 or node.Mx != 0 or node.My != 0:
+            # xForce yForce zForce xMoment yMoment zMoment
+            self._load_args[node] = (node.idx, 0, 0, node.Fz, node.Mx, node.My, 0)
+        else:
+            self._load_args.pop(node, None)
+
     def add_member(
         self,
         node_i: Union[Node, str, int],
@@ -304,9 +566,170 @@ class Grid:
         the_node_i = self.get_node(node_i)
         the_node_j = self.get_node(node_j)
         member = Member(self.no_members, the_node_i, the_node_j, EI, GJ)
+        member._grid = self
         self.members.append(member)
+        if self._member_by_endpoints is not None:
+            endpoints = frozenset((the_node_i.label, the_node_j.label))
+            self._member_by_endpoints.setdefault(endpoints, member)
+        self._invalidate_soa()
         return member
 
+    def _relabel_node(self, node: Node, old_label: str):
+        """
+        Moves a node to its new label in the label lookups.
+
+        Parameters
+        ----------
+        node : Node
+            The node that has been relabelled.
+        old_label : str
+            The previous label of the node.
+
+        Returns
+        -------
+        None.
+
+        """
+        old_match = self._node_by_label.get(old_label, [])
+        if node in old_match:
+            old_match.remove(node)
+            if not old_match:
+                del self._node_by_label[old_label]
+        self._node_by_label.setdefault(node.label, []).append(node)
+        self._member_by_endpoints = None
+
+    def _update_geometry(self, node: Node):
+        """
+        Updates the geometry of the members connected to a node that has moved.
+
+        Parameters
+        ----------
+        node : Node
+            The node that has moved.
+
+        Returns
+        -------
+        None.
+
+        """
+        for m in self.members:
+            if m.node_i is node or m.node_j is node:
+                m._set_geometry()
+
+    def _invalidate_soa(self):
+        """
+        Marks the structure-of-arrays view, and anything derived from it, as stale
+        so it is rebuilt when next needed. This is called when nodes or members
+        are added, or when their properties change.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._soa_valid = False
+        self.__dict__.pop("_extents", None)
+
+    def _ensure_soa(self):
+        """
+        Builds the structure-of-arrays view of the grid: contiguous arrays of the
+        node and member properties, in the order of :attr:`nodes` and
+        :attr:`members`. These are rebuilt only after nodes or members are added,
+        or their properties change.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self._soa_valid:
+            return
+
+        self._nodes_idx = np.array([n.idx for n in self.nodes], dtype=int)
+        self._nodes_x = np.array([n.x for n in self.nodes], dtype=float)
+        self._nodes_y = np.array([n.y for n in self.nodes], dtype=float)
+
+        self._mem_idx = np.array([m.idx for m in self.members], dtype=int)
+        self._mem_i = np.array([m.node_i.idx for m in self.members], dtype=int)
+        self._mem_j = np.array([m.node_j.idx for m in self.members], dtype=int)
+        self._mem_EI = np.array([m.EI for m in self.members], dtype=float)
+        self._mem_GJ = np.array([m.GJ for m in self.members], dtype=float)
+
+        # Member geometry follows directly from the nodal coordinates
+        pos = {idx: k for k, idx in enumerate(self._nodes_idx.tolist())}
+        i = np.array([pos[idx] for idx in self._mem_i.tolist()], dtype=int)
+        j = np.array([pos[idx] for idx in self._mem_j.tolist()], dtype=int)
+        self._mem_dx = self._nodes_x[j] - self._nodes_x[i]
+        self._mem_dy = self._nodes_y[j] - self._nodes_y[i]
+        self._mem_L = np.hypot(self._mem_dx, self._mem_dy)
+
+        self._soa_valid = True
+
+    @cached_property
+    def _extents(self) -> Tuple[float, float]:
+        """
+        The extents of the grid nodes along the x- and y-axes, cached until a node
+        is added or moved.
+        """
+        self._ensure_soa()
+        return float(np.ptp(self._nodes_x)), float(np.ptp(self._nodes_y))
+
+    def _member_arrays(self) -> Tuple[np.ndarray, ...]:
+        """
+        Returns the member properties from the structure-of-arrays view.
+
+        Returns
+        -------
+        Tuple[np.ndarray, ...]
+            The arrays of `EI`, `GJ`, `L`, `delta_x`, and `delta_y` of the members.
+
+        """
+        self._ensure_soa()
+        return self._mem_EI, self._mem_GJ, self._mem_L, self._mem_dx, self._mem_dy
+
+    def get_local_stiffnesses(self) -> np.ndarray:
+        """
+        Returns the local stiffness matrices of all members of the grid, in the
+        order of :attr:`members`.
+
+        Returns
+        -------
+        K : np.ndarray
+            A `(N,6,6)` array of the member stiffness matrices in local coordinates.
+
+        """
+        EI, GJ, L, _, _ = self._member_arrays()
+        return Member.batch_local_stiffness(EI, GJ, L)
+
+    def get_transformation_matrices(self) -> np.ndarray:
+        """
+        Returns the transformation matrices of all members of the grid, in the
+        order of :attr:`members`.
+
+        Returns
+        -------
+        T : np.ndarray
+            A `(N,6,6)` array of the member transformation matrices.
+
+        """
+        _, _, L, dx, dy = self._member_arrays()
+        return Member.batch_transformation_matrix(dx / L, dy / L)
+
+    def get_global_stiffnesses(self) -> np.ndarray:
+        """
+        Returns the stiffness matrices in global coordinates of all members of the
+        grid, in the order of :attr:`members`.
+
+        Returns
+        -------
+        Kg : np.ndarray
+            A `(N,6,6)` array of the member stiffness matrices in global coordinates.
+
+        """
+        K = self.get_local_stiffnesses()
+        T = self.get_transformation_matrices()
+        return np.einsum("nki,nkl,nlj->nij", T, K, T, optimize=True)
+
     def add_load(
         self,
         node: Union[Node, str, int],
@@ -408,7 +831,7 @@ class Grid:
             return node
 
         if isinstance(node, str):
-            node_match = [n for n in self.nodes if n.label == node]
+            node_match = self._node_by_label.get(node, [])
             if len(node_match) > 1:
                 raise ValueError(f"More than one node has label: '{node}'")
             elif len(node_match) == 0:
@@ -448,30 +871,56 @@ class Grid:
             return self.members[member]
 
         if isinstance(member, tuple):
-            node_i_lbl = [m.node_i.label for m in self.members]
-            node_j_lbl = [m.node_j.label for m in self.members]
-            for n_comb in itertools.product(node_i_lbl, node_j_lbl):
-                if sorted(member) == sorted(n_comb):
-                    # The combination exists, so now let's find the member
-                    the_member = [
-                        m
-                        for m in self.members
-                        if (m.node_i.label == member[0] and m.node_j.label == member[1])
-                        or (m.node_i.label == member[1] and m.node_j.label == member[0])
-                    ]
-                    return the_member[0]
-
-            raise ValueError(
-                f"Member with nodes {member[0]} and {member[1]} could not be found."
-            )
+            if self._member_by_endpoints is None:
+                # Rebuild the lookup after end nodes or their labels have changed
+                self._member_by_endpoints = {}
+                for m in self.members:
+                    endpoints = frozenset((m.node_i.label, m.node_j.label))
+                    self._member_by_endpoints.setdefault(endpoints, m)
+            the_member = self._member_by_endpoints.get(frozenset(member))
+            if the_member is None:
+                raise ValueError(
+                    f"Member with nodes {member[0]} and {member[1]} could not be found."
+                )
+            return the_member
 
         # We should never get here
         raise ValueError("Either member object or id must be passed")
 
-    def analyze(self) -> osp:
+    def _model_key(self) -> tuple:
+        """
+        Returns a key identifying the analysis model: the grid geometry, member
+        properties, supports, and loads.
+
+        Returns
+        -------
+        tuple
+            The model key.
+
+        """
+        nodes = tuple(
+            (n.idx, n.x, n.y, n.support, n.Fz, n.Mx, n.My) for n in self.nodes
+        )
+        members = tuple(
+            (m.idx, m.node_i.idx, m.node_j.idx, m.EI, m.GJ) for m in self.members
+        )
+        return nodes, members
+
+    def analyze(self, solver: str = None, reuse: bool = False) -> osp:
         """
         Executes the analysis for the grid object using OpenSeesPy
 
+        Parameters
+        ----------
+        solver : str, optional
+            The OpenSees system of equations to solve with, e.g. "BandGeneral",
+            "UmfPack", or "FullGeneral". The default is :attr:`SOLVER`.
+        reuse : bool, optional
+            Whether to keep the existing results if this grid was the last one
+            analyzed, with the same solver, and it has not changed since. Only
+            use this if the OpenSeesPy model has not been wiped or manipulated
+            directly since that analysis. The default is False.
+
         Returns
         -------
         osp : OpenSeesPy instance
@@ -479,17 +928,33 @@ class Grid:
             or otherwise manipulating the model further.
 
         """
+        if solver is None:
+            solver = self.SOLVER
+
+        key = (self._model_key(), solver)
+        active = Grid._active_analysis
+        if reuse and active is not None and active[0]() is self and active[1] == key:
+            return osp
+
         # remove any existing model
+        Grid._active_analysis = None
         osp.wipe()
 
         # set modelbuilder, 3 dims, 6 DOF
         osp.model("basic", "-ndm", 3, "-ndf", 6)
 
-        # create nodes & add support, load, if any
-        for n in self.nodes:
-            osp.node(n.idx, n.x, n.y, 0.0)
-            if n.support is not None:
-                osp.fix(n.idx, *n.support.value)
+        self._ensure_soa()
+
+        # create nodes
+        node_args = zip(
+            self._nodes_idx.tolist(), self._nodes_x.tolist(), self._nodes_y.tolist()
+        )
+        for idx, x, y in node_args:
+            osp.node(idx, x, y, 0.0)
+
+        # add supports, if any
+        for args in self._fix_args.values():
+            osp.fix(*args)
 
         # Nominal E and G
         E = 200e9  # GPa
@@ -504,23 +969,20 @@ class Grid:
 
         # define elements
         # tag   *[ndI ndJ]  A  E  G  Jx  Iy   Iz  transfOBJs
-        for m in self.members:
-            I = m.EI / E
-            J = m.GJ / G
-            A = I / 1e6  # rough
-            osp.element(
-                "elasticBeamColumn",
-                m.idx,
-                m.node_i.idx,
-                m.node_j.idx,
-                A,
-                E,
-                G,
-                J,
-                I,
-                0.1 * I,
-                1,
-            )
+        I = self._mem_EI / E
+        J = self._mem_GJ / G
+        A = I / 1e6  # rough
+        mbr_args = zip(
+            self._mem_idx.tolist(),
+            self._mem_i.tolist(),
+            self._mem_j.tolist(),
+            A.tolist(),
+            J.tolist(),
+            I.tolist(),
+            (0.1 * I).tolist(),
+        )
+        for idx, i, j, A_m, J_m, Iy_m, Iz_m in mbr_args:
+            osp.element("elasticBeamColumn", idx, i, j, A_m, E, G, J_m, Iy_m, Iz_m, 1)
 
         # create TimeSeries
         osp.timeSeries("Constant", 1)
@@ -528,19 +990,16 @@ class Grid:
         # create a plain load pattern
         osp.pattern("Plain", 1, 1)
 
-        # Create the nodal load: nodeID loadvals
-        # xForce yForce zForce xMoment yMoment zMoment
-        for n in self.nodes:
-            if n.Fz != 0 or n.Mx != 0 or n.My != 0:
-                loadVals = [0, 0, n.Fz, n.Mx, n.My, 0]
-                osp.load(n.idx, *loadVals)
+        # Create the nodal loads: nodeID loadvals
+        for args in self._load_args.values():
+            osp.load(*args)
 
         # ------------------------------
         # Start of analysis generation
         # ------------------------------
 
         # create SOE
-        osp.system("FullGeneral")
+        osp.system(solver)
 
         # create DOF number
         osp.numberer("RCM")
@@ -563,6 +1022,7 @@ class Grid:
         # calculate reactions
         osp.reactions()
 
+        Grid._active_analysis = (weakref.ref(self), key)
         return osp
 
     def get_displacement(self, node=Union[Node, str, int], dof: int = -1):
@@ -618,7 +1078,10 @@ class Grid:
     def get_system_stiffness(self) -> np.ndarray:
         """
         Returns the system global stiffness matrix after the imposition of boundary
-        conditions.
+        conditions. The matrix is read from the current analysis of the grid,
+        whichever solver it used; only if that system cannot return the matrix
+        is the grid re-analyzed using "FullGeneral". The matrix is cached until
+        the grid changes, and a copy is returned.
 
         Returns
         -------
@@ -626,9 +1089,32 @@ class Grid:
             A square numpy array of the reduced global stiffness matrix
 
         """
-        K = osp.printA("-ret")
+        active = Grid._active_analysis
+        if (
+            active is None
+            or active[0]() is not self
+            or active[1][0] != self._model_key()
+        ):
+            self.analyze()
+
+        # Reuse the matrix if the model has not changed since it was retrieved
+        key = Grid._active_analysis[1]
+        if self._system_stiffness is not None and self._system_stiffness[0] == key:
+            return self._system_stiffness[1].copy()
+
         n = osp.systemSize()
-        return np.reshape(K, (n, n))
+        K = osp.printA("-ret")
+        if K is None or np.size(K) != n * n:
+            # Not every OpenSees build can return the matrix of a sparse system
+            self.analyze(solver="FullGeneral")
+            key = Grid._active_analysis[1]
+            n = osp.systemSize()
+            K = osp.printA("-ret")
+
+        K = np.asarray(K, dtype=np.float64).reshape(n, n)
+        K.flags.writeable = False
+        self._system_stiffness = (key, K)
+        return K.copy()
 
     def get_system_force(self) -> np.ndarray:
         """
@@ -666,7 +1152,25 @@ class Grid:
 
         """
         the_member = self.get_member(member)
-        return np.array(osp.eleForce(the_member.idx, dof))
+        return np.asarray(osp.eleForce(the_member.idx, dof), dtype=np.float64)
+
+    def get_all_member_forces(self) -> np.ndarray:
+        """
+        Returns the member end forces of all members in the global coordinate
+        system, in the order of :attr:`members`.
+
+        Returns
+        -------
+        F : np.ndarray
+            A `(N,12)` array: for each member, 6 DOFs for node i, and 6 DOFs for
+            node j, in the order Fx, Fy, Fz, Mx, My, Mz.
+
+        """
+        self._ensure_soa()
+        F = np.empty((self.no_members, 12))
+        for row, idx in zip(F, self._mem_idx.tolist()):
+            row[:] = osp.eleForce(idx)
+        return F
 
     def plot_results(
         self,
@@ -719,52 +1223,27 @@ class Grid:
 
         """
 
-        if type(scale_factor) == float:
-            sf_dsd = scale_factor
-            sf_bmd = 1.0
-            sf_sfd = 1.0
-            sf_tmd = 1.0
-        else:
-            if len(scale_factor) != 4:
-                raise ValueError("The list of scale factors must have length 4.")
-            sf_dsd = scale_factor[0]
-            sf_bmd = scale_factor[1]
-            sf_sfd = scale_factor[2]
-            sf_tmd = scale_factor[3]
-
-        self.plot_grid(figsize=figsize, axes_on=axes_on, axis_title=axis_title)
-        self.plot_dsd(
-            scale_factor=sf_dsd,
-            figsize=figsize,
-            axes_on=axes_on,
-            axis_title=axis_title,
-        )
-        self.plot_bmd(
-            figsize=figsize,
-            scale_factor=sf_bmd,
-            axes_on=axes_on,
-            axis_title=axis_title,
-            values=values,
-        )
-        self.plot_sfd(
-            figsize=figsize,
-            scale_factor=sf_sfd,
-            axes_on=axes_on,
-            axis_title=axis_title,
-            values=values,
-        )
-        self.plot_tmd(
-            figsize=figsize,
-            scale_factor=sf_tmd,
-            axes_on=axes_on,
-            axis_title=axis_title,
-            values=values,
-        )
-
-        if save_figs:
-            save_figs_to_file(filename, transparent=transparent, bbox=bbox, pad=pad)
-            plt.close("all")
-        else:
+        sf_dsd, sf_bmd, sf_sfd, sf_tmd = _unpack_scale(scale_factor)
+
+        plots = [
+            ("mdl", self.plot_grid, {}),
+            ("dsd", self.plot_dsd, {"scale_factor": sf_dsd}),
+            ("bmd", self.plot_bmd, {"scale_factor": sf_bmd, "values": values}),
+            ("sfd", self.plot_sfd, {"scale_factor": sf_sfd, "values": values}),
+            ("tmd", self.plot_tmd, {"scale_factor": sf_tmd, "values": values}),
+        ]
+        for suffix, plot, kwargs in plots:
+            fig = plot(
+                figsize=figsize, axes_on=axes_on, axis_title=axis_title, **kwargs
+            )
+            if save_figs:
+                # Save and release each figure before creating the next
+                save_fig_to_file(
+                    fig, filename, suffix, transparent=transparent, bbox=bbox, pad=pad
+                )
+                plt.close(fig)
+
+        if not save_figs:
             plt.show()
 
     def plot_grid(
@@ -787,24 +1266,24 @@ class Grid:
 
         Returns
         -------
-        None.
+        fig : matplotlib.pyplot.Figure
+            The figure.
 
         """
         if figsize is None:
             figsize = self.FIGSIZE
 
-        ospv.plot_model(fig_wi_he=figsize,
-                        node_supports=False)
-        fig = plt.gcf()
-        fig.set_figwidth(figsize[0])
-        fig.set_figheight(figsize[1])
+        fig = plt.figure(figsize=figsize)
+        ax = fig.add_subplot(111, projection="3d")
+        ospv.plot_model(ax=ax, node_supports=False)
         if axis_title:
-            plt.gcf().suptitle("Model")
+            fig.suptitle("Model")
 
         if not axes_on:
-            plt.gca().set_axis_off()
+            ax.set_axis_off()
 
         fig.tight_layout()
+        return fig
         
     def _plot_model(self, ax):
         """
@@ -843,18 +1322,22 @@ class Grid:
 
         Returns
         -------
-        None.
+        fig : matplotlib.pyplot.Figure
+            The figure.
 
         """
         if figsize is None:
             figsize = self.FIGSIZE
 
         if scale_factor == 0:
-            disps = {n.label: self.get_displacement(n, 3) for n in self.nodes}
-            max_disp = max(abs(min(disps.values())), abs(max(disps.values())))
-            x = [n.x for n in self.nodes]
-            y = [n.y for n in self.nodes]
-            grid_size = max(max(x) - min(x), max(y) - min(y))
+            self._ensure_soa()
+            disps = np.fromiter(
+                (osp.nodeDisp(idx, 3) for idx in self._nodes_idx.tolist()),
+                dtype=float,
+                count=self.no_nodes,
+            )
+            max_disp = np.abs(disps).max()
+            grid_size = max(self._extents)
 
             # in case of very small nodal values
             max_disp = ospv.max_u_abs_from_beam_defo_interp_3d(max_disp,nep=21)
@@ -867,8 +1350,8 @@ class Grid:
 
         
 
-        fig = plt.figure()
-        ax = fig.add_subplot(111, projection=Axes3D.name)
+        fig = plt.figure(figsize=figsize)
+        ax = fig.add_subplot(111, projection="3d")
         self._plot_model(ax)        
         ospv.plot_defo(sfac=scale_factor,
                        unDefoFlag=False,
@@ -876,15 +1359,13 @@ class Grid:
                        endDispFlag=False,
                        node_supports=False
                        )
-        fig = plt.gcf()
-        fig.set_figwidth(figsize[0])
-        fig.set_figheight(figsize[1])
         if axis_title:
-            plt.gcf().suptitle(f"Displaced Shape\n(Scale: {scale_factor})")
+            fig.suptitle(f"Displaced Shape\n(Scale: {scale_factor})")
         if not axes_on:
-            plt.gca().set_axis_off()
+            ax.set_axis_off()
 
         fig.tight_layout()
+        return fig
 
     def plot_bmd(
         self,
@@ -912,7 +1393,8 @@ class Grid:
 
         Returns
         -------
-        None.
+        fig : matplotlib.pyplot.Figure
+            The figure.
 
         """
         if figsize is None:
@@ -924,17 +1406,19 @@ class Grid:
                                       node_supports=False,
                                       alt_model_plot=2)
         self._plot_model(ax)
-        fig = plt.gcf()
+        # opsvis makes its own figure, since it cannot plot to a supplied 3d axis
+        fig = ax.figure
         fig.set_figwidth(figsize[0])
         fig.set_figheight(figsize[1])
-        plt.gca().set_box_aspect(None)
+        ax.set_box_aspect(None)
         if axis_title:
             fig.suptitle(f"Bending Moment Diagram\n(Scale: {scale_factor})")
 
         if not axes_on:
-            plt.gca().set_axis_off()
+            ax.set_axis_off()
 
         fig.tight_layout()
+        return fig
 
     def plot_sfd(
         self,
@@ -963,7 +1447,8 @@ class Grid:
 
         Returns
         -------
-        None.
+        fig : matplotlib.pyplot.Figure
+            The figure.
 
         """
         if figsize is None:
@@ -975,17 +1460,18 @@ class Grid:
                                       node_supports=False,
                                       alt_model_plot=2)
         self._plot_model(ax)
-        fig = plt.gcf()
+        fig = ax.figure
         fig.set_figwidth(figsize[0])
         fig.set_figheight(figsize[1])
-        plt.gca().set_box_aspect(None)
+        ax.set_box_aspect(None)
         if axis_title:
-            plt.gcf().suptitle(f"Shear Force Diagram\n(Scale: {scale_factor})")
+            fig.suptitle(f"Shear Force Diagram\n(Scale: {scale_factor})")
 
         if not axes_on:
-            plt.gca().set_axis_off()
+            ax.set_axis_off()
 
         fig.tight_layout()
+        return fig
 
     def plot_tmd(
         self,
@@ -1014,7 +1500,8 @@ class Grid:
 
         Returns
         -------
-        None.
+        fig : matplotlib.pyplot.Figure
+            The figure.
 
         """
         if figsize is None:
@@ -1029,14 +1516,15 @@ class Grid:
                                       #fmt_secforce2={"color":"r"},
                                       alt_model_plot=2)
         self._plot_model(ax)
-        fig = plt.gcf()
+        fig = ax.figure
         fig.set_figwidth(figsize[0])
         fig.set_figheight(figsize[1])
-        plt.gca().set_box_aspect(None)
+        ax.set_box_aspect(None)
         if axis_title:
-            plt.gcf().suptitle(f"Torsion Moment Diagram\n(Scale: {scale_factor})")
+            fig.suptitle(f"Torsion Moment Diagram\n(Scale: {scale_factor})")
 
         if not axes_on:
-            plt.gca().set_axis_off()
+            ax.set_axis_off()
 
         fig.tight_layout()
+        return fig
@@ -69,17 +69,53 @@ def save_figs_to_file(
             pp.close()
         else:
             for i, fig in enumerate(figs):
-                if use_std_ends:
-                    f = stem + "_" + std_ends[i] + "." + ext
-                else:
-                    f = stem + f"_{i+1}" + "." + ext
-                fig.savefig(f, format=ext, transparent=transparent, dpi=500)
-                if bbox:
-                    crop_to_bbox(f, pad)
+                suffix = std_ends[i] if use_std_ends else f"{i+1}"
+                save_fig_to_file(
+                    fig, filename, suffix, transparent=transparent, bbox=bbox, pad=pad
+                )
 
     return
 
 
+def save_fig_to_file(
+    fig: plt.Figure,
+    filename: str,
+    suffix: str,
+    transparent: bool = False,
+    bbox: bool = False,
+    pad: int = 20,
+):
+    """
+    Saves a single figure to its own file, named as per :func:`save_figs_to_file`.
+
+    Parameters
+    ----------
+    fig : matplotlib.pyplot.Figure
+        The figure to save.
+    filename : string
+        The file name from which the figure file name is formed; the figure is
+        saved to `stem_suffix.ext`.
+    suffix : string
+        The suffix to add to the stem of the file name, e.g. "bmd".
+    transparent : bool, optional
+        Whether or not the plot should be transparent. The default is False.
+    bbox : bool, optional
+        Whether or not to crop the figure to a bounding box of its contents. Only
+        applies to image files, e.g., png, jpg, etc (not PDF)
+    pad : int, optional
+        If applying the bbox cropping to an image, a padding to apply to the
+        contents. Defaults to 20 px.
+    """
+    if "." not in filename:
+        return
+
+    stem, ext = filename.split(".")
+    f = stem + "_" + suffix + "." + ext
+    fig.savefig(f, format=ext, transparent=transparent, dpi=500)
+    if bbox:
+        crop_to_bbox(f, pad)
+
+
 def crop_to_bbox(file: str, pad: int = 0):
     """
     Crops the image to the bounding box, but adds a padding. This function
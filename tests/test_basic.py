@@ -127,3 +127,346 @@ def test_plotting(monkeypatch):
     grid = do_ospg_analysis()
     monkeypatch.setattr(plt, "show", lambda: None)
     grid.plot_results()
+
+
+def test_local_stiffnesses():
+    """
+    Check the batched member local stiffness matrices against the textbook form
+    """
+
+    grid = do_ospg_analysis()
+    Ks = grid.get_local_stiffnesses()
+    assert Ks.shape == (grid.no_members, 6, 6)
+
+    for m, K in zip(grid.members, Ks):
+        EI, GJ, L = m.EI, m.GJ, m.L
+        k11 = 12 * EI / L**3
+        k13 = 6 * EI / L**2
+        k22 = GJ / L
+        k33 = 4 * EI / L
+        k36 = 2 * EI / L
+        K_ref = np.array(
+            [
+                [k11, 0, k13, -k11, 0, k13],
+                [0, k22, 0, 0, -k22, 0],
+                [k13, 0, k33, -k13, 0, k36],
+                [-k11, 0, -k13, k11, 0, -k13],
+                [0, -k22, 0, 0, k22, 0],
+                [k13, 0, k36, -k13, 0, k33],
+            ]
+        )
+        assert K == pytest.approx(K_ref)
+        assert m.get_local_stiffness() == pytest.approx(K_ref)
+
+
+def test_global_stiffnesses():
+    """
+    Check the batched member global stiffness matrices against the per-member ones
+    """
+
+    grid = do_ospg_analysis()
+    Kgs = grid.get_global_stiffnesses()
+    assert Kgs.shape == (grid.no_members, 6, 6)
+
+    for m, T, Kg in zip(grid.members, grid.get_transformation_matrices(), Kgs):
+        assert T == pytest.approx(m.get_transformation_matrix())
+        assert Kg == pytest.approx(m.get_global_stiffness())
+
+
+def test_member_matrix_cache():
+    """
+    Check the member matrices are cached, and refreshed when the member changes
+    """
+
+    grid = do_ospg_analysis()
+    m = grid.members[0]
+    K = m.K_local
+    assert m.K_local is K
+
+    # The get_* methods return copies the caller is free to modify
+    k = m.get_local_stiffness()
+    k *= 2
+    assert m.get_local_stiffness() == pytest.approx(K)
+
+    m.EI *= 2
+    assert m.K_local is not K
+    assert m.get_local_stiffness()[0, 0] == pytest.approx(2 * K[0, 0])
+
+
+def test_get_member():
+    """
+    Check members are found from their node labels, in either order
+    """
+
+    grid = do_ospg_analysis()
+    assert grid.get_member(("A", "E")) is grid.members[0]
+    assert grid.get_member(("E", "B")) is grid.members[1]
+
+    with pytest.raises(ValueError):
+        grid.get_member(("A", "B"))
+
+    # The lookup follows a change of end node
+    m = grid.get_member(("C", "E"))
+    m.node_j = grid.get_node("D")
+    assert grid.get_member(("D", "C")) is m
+    with pytest.raises(ValueError):
+        grid.get_member(("C", "E"))
+
+
+def test_global_stiffness_closed_form():
+    """
+    Check the closed-form member global stiffness against T.T @ K @ T
+    """
+
+    grid = ospg.Grid()
+    grid.add_node("A", 0.0, 0.0)
+    for i, (x, y) in enumerate([(3.0, 0.0), (0.0, -2.0), (1.5, 2.5), (-4.0, 1.0)]):
+        grid.add_node(f"N{i}", x, y)
+        grid.add_member("A", f"N{i}", 25e3, 15e3)
+
+    for m in grid.members:
+        K = m.get_local_stiffness()
+        T = m.get_transformation_matrix()
+        assert m.get_global_stiffness() == pytest.approx(T.T @ K @ T)
+
+
+def test_analysis_reuse():
+    """
+    Check a repeated analysis can be skipped only while the grid is unchanged
+    """
+
+    grid = do_ospg_analysis()
+    delta_E = grid.get_displacement("E", 3)
+    grid.analyze(reuse=True)
+    assert grid.get_displacement("E", 3) == pytest.approx(delta_E)
+
+    # Another grid's analysis replaces the model in OpenSeesPy
+    other = do_ospg_analysis()
+    other.add_load("E", 2 * grid_params()[6])
+    other.analyze()
+    grid.analyze(reuse=True)
+    assert grid.get_displacement("E", 3) == pytest.approx(delta_E)
+
+    # Changing the loads of the grid requires a new analysis
+    P, Mx, My = getF()
+    grid.add_load("E", 2 * P, 2 * Mx, 2 * My)
+    grid.analyze(reuse=True)
+    assert grid.get_displacement("E", 3) == pytest.approx(2 * delta_E)
+
+    # So does changing the member properties
+    for m in grid.members:
+        m.EI *= 2
+        m.GJ *= 2
+    grid.analyze(reuse=True)
+    assert grid.get_displacement("E", 3) == pytest.approx(delta_E)
+
+
+def test_saving_plots(tmp_path):
+    """
+    Check each results plot is saved to its own file and then closed
+    """
+
+    plt.close("all")
+    grid = do_ospg_analysis()
+    filename = str(tmp_path / "results.png")
+    grid.plot_results(save_figs=True, filename=filename)
+
+    for suffix in ["mdl", "dsd", "bmd", "sfd", "tmd"]:
+        assert (tmp_path / f"results_{suffix}.png").exists()
+    assert plt.get_fignums() == []
+
+
+def test_system_stiffness():
+    """
+    Check the system stiffness is available after the default (banded) analysis
+    """
+
+    grid = do_ospg_analysis()
+    delta_E = grid.get_displacement("E", 3)
+
+    K = grid.get_system_stiffness()
+    n = K.shape[0]
+    assert K.shape == (n, n)
+    assert K == pytest.approx(K.T)
+    assert grid.get_displacement("E", 3) == pytest.approx(delta_E)
+
+    # The cached matrix is returned as a copy the caller is free to modify
+    K *= 2
+    assert grid.get_system_stiffness() == pytest.approx(K / 2)
+    K /= 2
+
+    # It matches the matrix of a dense analysis
+    dense = do_ospg_analysis()
+    dense.analyze(solver="FullGeneral")
+    assert K == pytest.approx(dense.get_system_stiffness())
+
+
+def test_all_member_forces():
+    """
+    Check the forces of all members match those queried member by member
+    """
+
+    grid = do_ospg_analysis()
+    F = grid.get_all_member_forces()
+    assert F.shape == (grid.no_members, 12)
+
+    for m, F_m in zip(grid.members, F):
+        assert F_m == pytest.approx(grid.get_member_forces(m))
+
+
+def test_arrays_follow_changes():
+    """
+    Check the grid's member arrays follow changes to node and member properties
+    """
+
+    grid = do_ospg_analysis()
+    for m in grid.members:
+        m.EI *= 2
+
+    Ks = grid.get_local_stiffnesses()
+    for m, K in zip(grid.members, Ks):
+        assert K == pytest.approx(m.get_local_stiffness())
+
+    Lae, Lbe, Lce, Lde = grid_params()[:4]
+    assert grid._extents == pytest.approx((Lae + Lce, Lbe + Lde))
+    grid.get_node("A").x -= 1.0
+    assert grid._extents == pytest.approx((Lae + 1.0 + Lce, Lbe + Lde))
+
+    # The members follow the moved node, both one by one and in the batch
+    assert grid.get_member(("A", "E")).L == pytest.approx(Lae + 1.0)
+    Ks = grid.get_local_stiffnesses()
+    Kgs = grid.get_global_stiffnesses()
+    for m, K, Kg in zip(grid.members, Ks, Kgs):
+        assert K == pytest.approx(m.get_local_stiffness())
+        assert Kg == pytest.approx(m.get_global_stiffness())
+
+
+def test_member_node_change():
+    """
+    Check reassigning an end node updates the member geometry and matrices
+    """
+
+    grid = do_ospg_analysis()
+    m = grid.get_member(("A", "E"))
+    Kg = m.get_global_stiffness()
+
+    m.node_i = grid.get_node("B")
+    assert (m.delta_x, m.delta_y) == pytest.approx((0.0, -grid_params()[1]))
+    assert m.L == pytest.approx(grid_params()[1])
+
+    K = m.get_local_stiffness()
+    T = m.get_transformation_matrix()
+    assert m.get_global_stiffness() is not Kg
+    assert m.get_global_stiffness() == pytest.approx(T.T @ K @ T)
+
+
+def test_unpack_scale():
+    """
+    Check any real number is taken as the deformation scale, and that a list of
+    scale factors must have length 4
+    """
+
+    from ospgrid.grid import _unpack_scale
+
+    assert _unpack_scale(2) == (2.0, 1.0, 1.0, 1.0)
+    assert _unpack_scale(np.float64(2.0)) == (2.0, 1.0, 1.0, 1.0)
+    assert _unpack_scale([2, 3, 4, 5]) == (2.0, 3.0, 4.0, 5.0)
+
+    with pytest.raises(ValueError):
+        _unpack_scale([1.0, 2.0])
+
+    grid = do_ospg_analysis()
+    with pytest.raises(ValueError):
+        grid.plot_results(scale_factor=[1.0, 2.0])
+
+
+def test_analysis_follows_member_changes():
+    """
+    Check the analysis uses member properties changed after the member was added
+    """
+
+    grid = do_ospg_analysis()
+    delta_E = grid.get_displacement("E", 3)
+
+    for m in grid.members:
+        m.EI *= 2
+        m.GJ *= 2
+    grid.analyze()
+    assert grid.get_displacement("E", 3) == pytest.approx(delta_E / 2)
+
+
+def test_node_attribute_loads():
+    """
+    Check loads and supports assigned directly to node attributes are analyzed
+    """
+
+    grid = do_ospg_analysis()
+    delta_E = grid.get_displacement("E", 3)
+
+    node_E = grid.get_node("E")
+    node_E.Fz *= 2
+    node_E.Mx *= 2
+    node_E.My *= 2
+    grid.analyze()
+    assert grid.get_displacement("E", 3) == pytest.approx(2 * delta_E)
+
+    node_A = grid.get_node("A")
+    node_A.support = ospg.Support.FIXED
+    grid.analyze()
+    assert grid.get_displacement("A", 3) == pytest.approx(0.0)
+    assert grid.get_displacement("E", 3) != pytest.approx(2 * delta_E)
+
+
+def test_relabel_node():
+    """
+    Check nodes and members are found by a node's new label after relabelling
+    """
+
+    grid = do_ospg_analysis()
+    node = grid.get_node("E")
+    node.label = "Z"
+
+    assert grid.get_node("Z") is node
+    with pytest.raises(ValueError):
+        grid.get_node("E")
+    assert grid.get_member(("A", "Z")) is grid.members[0]
+
+
+def test_cleared_nodes_detached():
+    """
+    Check nodes discarded by clear no longer affect the grid
+    """
+
+    grid = ospg.Grid()
+
+    def build():
+        grid.add_node("A", 0.0, 0.0)
+        grid.add_node("B", 4.0, 0.0)
+        grid.add_member("A", "B", 25e3, 15e3)
+        grid.add_support("B", ospg.Support.FIXED)
+
+    build()
+    old_node = grid.get_node("A")
+    grid.clear()
+    build()
+
+    old_node.set_load(Fz=-5)
+    grid.analyze()
+    assert grid.get_displacement("A", 3) == pytest.approx(0.0)
+
+
+def test_reindexed_node_loads():
+    """
+    Check the load and support of a node follow a change of its index
+    """
+
+    grid = do_ospg_analysis()
+    delta_E = grid.get_displacement("E", 3)
+
+    # Swap the indices of the loaded node E and the fixed node D
+    node_D = grid.get_node("D")
+    node_E = grid.get_node("E")
+    node_D.idx, node_E.idx = node_E.idx, node_D.idx
+    grid.analyze()
+    assert grid.get_displacement("E", 3) == pytest.approx(delta_E)
+    assert grid.get_displacement("D", 3) == pytest.approx(0.0)